@@ -0,0 +1,249 @@
+"""
+Shared helpers for the page.tsx auth fix scripts
+
+Used by fix-auth-placement.py, fix-nextjs15-auth-pattern.py,
+fix-client-component-auth.py and fix_auth_all.py. Patterns are compiled
+once here and reused by every script.
+"""
+
+import os
+import re
+import sys
+
+# ANSI colors
+class Colors:
+    RESET = '\033[0m'
+    RED = '\033[31m'
+    GREEN = '\033[32m'
+    YELLOW = '\033[33m'
+    BLUE = '\033[34m'
+    CYAN = '\033[36m'
+
+# Injected auth check block shared by every pattern below
+_AUTH_BLOCK = (
+    r'// Authentication check\s*\n\s*const session = await auth\(\)\s*\n'
+    r'\s*const sppgId = session\?\.user\?\.sppgId\s*\n\s*\n'
+    r'\s*if \(!sppgId\) \{\s*\n\s*redirect\([^\)]+\)\s*\n\s*\}\s*\n\s*\n'
+)
+
+# Auth block only ever matched anchored at a known offset
+AUTH_BLOCK_RE = re.compile(_AUTH_BLOCK)
+
+# Cheap detection of an auth check placed right after the opening `({`
+WRONG_PLACEMENT_RE = re.compile(r'async\s+function\s+\w+\s*\(\s*\{\s*\n\s*// Authentication check')
+
+CLIENT_AUTH_IMPORT_RE = re.compile(r"import\s+\{\s*auth\s*\}\s+from\s+['\"]@/lib/auth['\"]\s*\n")
+CLIENT_REDIRECT_IMPORT_RE = re.compile(r"import\s+\{\s*redirect\s*\}\s+from\s+['\"]next/navigation['\"]\s*\n")
+CLIENT_ASYNC_RE = re.compile(r'async function (\w+)\(')
+CLIENT_AUTH_BLOCK_RE = re.compile(r'\s*' + _AUTH_BLOCK, re.MULTILINE)
+
+AUTH_BODY = '''  // Authentication check
+  const session = await auth()
+  const sppgId = session?.user?.sppgId
+
+  if (!sppgId) {
+    redirect('/access-denied?reason=no-sppg')
+  }
+'''
+
+# Rebuilt function header, the auth body is appended after it as-is
+_HEADER_TEMPLATE = '''{}({{
+  {}
+}}: {}) {{
+'''
+
+# Log lines are collected and written to stdout in one go by flush_log()
+_LOG_BUF = []
+
+# Reset code and newline closing every log line, built once
+_LINE_END = Colors.RESET + '\n'
+
+def log(message, color=Colors.RESET):
+    # Pieces are only joined in flush_log(), no per-line string building
+    _LOG_BUF.extend((color, message, _LINE_END))
+
+def flush_log():
+    sys.stdout.write(''.join(_LOG_BUF))
+    sys.stdout.flush()
+    _LOG_BUF.clear()
+
+def walk_page_tsx(root):
+    """Recursively collect page.tsx paths under root as plain strings"""
+    page_files = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name == 'page.tsx':
+                    page_files.append(entry.path)
+    return page_files
+
+def write_file_atomic(file_path, content):
+    """
+    Write content to a temp file next to file_path and rename it over the
+    original, so an interrupted run never leaves a half-written page.
+    """
+    tmp_path = f"{file_path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _skip_ws(content, i):
+    """Index of the first non-whitespace char at or after i"""
+    n = len(content)
+    while i < n and content[i].isspace():
+        i += 1
+    return i
+
+def _skip_ws_back(content, i):
+    """Index just after the last non-whitespace char before i"""
+    while i > 0 and content[i - 1].isspace():
+        i -= 1
+    return i
+
+def _find_closing_brace(content, i, depth=1):
+    """Index of the `}` that closes `depth` open braces before i, or -1"""
+    while True:
+        close = content.find('}', i)
+        if close == -1:
+            return -1
+        open_ = content.find('{', i, close)
+        if open_ == -1:
+            depth -= 1
+            if depth == 0:
+                return close
+            i = close + 1
+        else:
+            depth += 1
+            i = open_ + 1
+
+def _function_start(content, paren):
+    """Start of `async function Name` directly before the `(` at paren, or -1"""
+    end = _skip_ws_back(content, paren)
+    i = end
+    while i > 0 and (content[i - 1].isalnum() or content[i - 1] == '_'):
+        i -= 1
+    if i == end:
+        return -1
+    j = _skip_ws_back(content, i)
+    if j == i or not content.endswith('function', 0, j):
+        return -1
+    j -= len('function')
+    k = _skip_ws_back(content, j)
+    if k == j or not content.endswith('async', 0, k):
+        return -1
+    return k - len('async')
+
+def _split_auth_in_params(content, idx):
+    """
+    Locate the function whose parameters hold the auth check at idx.
+    Returns (start, end, func_start, params_content, params_type) or None
+    if the shape doesn't match.
+    """
+    # `({` followed by a line break right before the comment
+    brace = _skip_ws_back(content, idx)
+    if brace == 0 or content[brace - 1] != '{' or '\n' not in content[brace:idx]:
+        return None
+    paren = _skip_ws_back(content, brace - 1)
+    if paren == 0 or content[paren - 1] != '(':
+        return None
+    paren -= 1
+    start = _function_start(content, paren)
+    if start == -1:
+        return None
+    func_start = content[start:_skip_ws_back(content, paren)]  # async function MyPage
+
+    block = AUTH_BLOCK_RE.match(content, idx)
+    if block is None:
+        return None
+
+    # `}` closing the destructured props, then the `: { ... }` annotation
+    props_end = _find_closing_brace(content, block.end())
+    if props_end == -1:
+        return None
+    params_content = content[block.end():props_end].strip()  # params
+    if not params_content:
+        return None
+    i = _skip_ws(content, props_end + 1)
+    if not content.startswith(':', i):
+        return None
+    i = _skip_ws(content, i + 1)
+    if not content.startswith('{', i):
+        return None
+    type_end = _find_closing_brace(content, i + 1)
+    if type_end == -1:
+        return None
+    params_type = content[i:type_end + 1]  # { params: ... }
+    i = _skip_ws(content, type_end + 1)
+    if not content.startswith(')', i):
+        return None
+    i = _skip_ws(content, i + 1)
+    if not content.startswith('{', i):
+        return None
+
+    return start, i + 1, func_start, params_content, params_type
+
+def rewrite_auth_in_params(content, body, params_only=False):
+    """
+    Linear scan over each auth comment, rebuilding every matched function
+    header with the auth check moved into `body`. Braces are matched by
+    depth so nested types like Promise<{ id: string }> work.
+    With params_only, only headers destructuring `params` are touched.
+    """
+    parts = []
+    last = 0
+    idx = content.find('// Authentication check')
+    while idx != -1:
+        found = _split_auth_in_params(content, idx)
+        if (found is not None and found[0] >= last
+                and (not params_only or found[3].startswith('params'))):
+            start, end, func_start, params_content, params_type = found
+            parts.append(content[last:start])
+            parts.append(_HEADER_TEMPLATE.format(func_start, params_content, params_type))
+            parts.append(body)
+            last = end
+            idx = content.find('// Authentication check', last)
+        else:
+            idx = content.find('// Authentication check', idx + 1)
+
+    if not parts:
+        return content
+
+    parts.append(content[last:])
+    return ''.join(parts)
+
+def fix_server_placement(content):
+    """
+    Move an auth check placed before `params` in the function parameters
+    to the start of the function body.
+    """
+    return rewrite_auth_in_params(content, AUTH_BODY, params_only=True)
+
+def fix_nextjs15(content):
+    """
+    Move an auth check placed before any destructured props in the
+    function parameters to the start of the function body.
+    """
+    return rewrite_auth_in_params(content, AUTH_BODY + '\n')
+
+def fix_client_component(content):
+    """
+    Remove async and auth check from Client Component
+    """
+    # Each step only runs when its literal anchor is present
+    if '@/lib/auth' in content:
+        content = CLIENT_AUTH_IMPORT_RE.sub('', content)
+    if 'next/navigation' in content:
+        content = CLIENT_REDIRECT_IMPORT_RE.sub('', content)
+    if 'async function' in content:
+        content = CLIENT_ASYNC_RE.sub(r'function \1(', content)
+    if '// Authentication check' in content:
+        content = CLIENT_AUTH_BLOCK_RE.sub('\n', content)
+    return content
@@ -19,103 +19,97 @@ Should be:
 """
 
 import os
-import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-# ANSI colors
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[31m'
-    GREEN = '\033[32m'
-    YELLOW = '\033[33m'
-    BLUE = '\033[34m'
-    CYAN = '\033[36m'
-
-def log(message, color=Colors.RESET):
-    print(f"{color}{message}{Colors.RESET}")
+from _auth_fix_lib import (
+    Colors,
+    WRONG_PLACEMENT_RE,
+    fix_server_placement,
+    flush_log,
+    log,
+    walk_page_tsx,
+    write_file_atomic,
+)
 
 def fix_auth_placement(content):
     """
     Fix auth check that's placed in function parameters.
     Move it to the start of function body.
     """
-    # Pattern: function declaration with auth check in params
-    pattern = r'(async function \w+)\s*\(\s*\{\s*\n\s*// Authentication check\s*\n\s*const session = await auth\(\)\s*\n\s*const sppgId = session\?\.user\?\.sppgId\s*\n\s*\n\s*if \(!sppgId\) \{\s*\n\s*redirect\([^\)]+\)\s*\n\s*\}\s*\n\s*\n\s*(params[^\}]*\})\s*:\s*(\{[^\}]+\})\s*\)\s*\{'
-    
-    def replacer(match):
-        func_decl = match.group(1)
-        params = match.group(2).strip()
-        param_type = match.group(3)
-        
-        # Rebuild with auth check in body
-        return f'''{func_decl}({{
-  {params}
-}}: {param_type}) {{
-  // Authentication check
-  const session = await auth()
-  const sppgId = session?.user?.sppgId
-
-  if (!sppgId) {{
-    redirect('/access-denied?reason=no-sppg')
-  }}
-'''
-    
-    fixed = re.sub(pattern, replacer, content, flags=re.MULTILINE | re.DOTALL)
+    fixed = fix_server_placement(content)
     
     return fixed if fixed != content else None
 
-def process_file(file_path):
+def _process_file(file_path):
     """Process a single file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            raw = f.read()
         
-        # Check if file has the problematic pattern
-        if '// Authentication check' not in content:
+        # Cheap byte scan first, only decode files that can possibly match
+        if raw.find(b'// Authentication check') == -1:
             return {'status': 'skip', 'reason': 'No auth check'}
+        # `async\s+function` may span any whitespace, so only anchor on the keyword
+        if raw.find(b'function') == -1:
+            return {'status': 'skip', 'reason': 'Auth check already correct'}
+        
+        content = raw.decode('utf-8')
         
         # Check if auth is in wrong place (in params)
-        if not re.search(r'async function \w+\s*\(\s*\{\s*\n\s*// Authentication check', content):
+        if not WRONG_PLACEMENT_RE.search(content):
             return {'status': 'skip', 'reason': 'Auth check already correct'}
         
-        log(f"\nFixing: {file_path}", Colors.CYAN)
-        
         fixed_content = fix_auth_placement(content)
         
         if fixed_content is None:
             return {'status': 'skip', 'reason': 'No changes needed'}
         
-        # Write back
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
+        # Write back atomically via a temp file
+        write_file_atomic(file_path, fixed_content)
         
-        log("  ✓ Fixed auth check placement", Colors.GREEN)
         return {'status': 'success'}
         
     except Exception as e:
         return {'status': 'error', 'error': str(e)}
 
+def process_file(file_path):
+    """
+    Process a single file in a worker process.
+    Logging is left to the parent so output stays in file order.
+    """
+    return file_path, _process_file(file_path)
+
 def main():
     log("\n🔧 Fix Auth Check Placement in Page Components", Colors.BLUE)
     log("=" * 70, Colors.BLUE)
     
-    app_dir = Path('src/app/(sppg)')
+    app_dir = 'src/app/(sppg)'
     
-    if not app_dir.exists():
+    if not os.path.isdir(app_dir):
         log("❌ Error: src/app/(sppg) directory not found", Colors.RED)
         return
     
     # Find all page.tsx files
-    page_files = list(app_dir.rglob('page.tsx'))
+    page_files = walk_page_tsx(app_dir)
     log(f"\n✓ Found {len(page_files)} page.tsx files", Colors.GREEN)
     
     results = {'success': 0, 'skip': 0, 'error': 0}
     
-    for file_path in page_files:
-        result = process_file(file_path)
+    flush_log()
+    
+    # Files are independent and scanning is CPU bound, so use processes
+    with ProcessPoolExecutor() as executor:
+        processed = list(executor.map(process_file, page_files, chunksize=16))
+    
+    for file_path, result in processed:
         results[result['status']] += 1
         
-        if result['status'] == 'error':
+        if result['status'] == 'success':
+            log(f"\nFixing: {file_path}", Colors.CYAN)
+            log("  ✓ Fixed auth check placement", Colors.GREEN)
+        elif result.get('reason') == 'No changes needed':
+            log(f"\nFixing: {file_path}", Colors.CYAN)
+        elif result['status'] == 'error':
             log(f"\n❌ Error in {file_path}:", Colors.RED)
             log(f"   {result['error']}", Colors.RED)
     
@@ -133,4 +127,7 @@ def main():
     log("\n📝 Next step: Run 'npx tsc --noEmit' to verify", Colors.CYAN)
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        flush_log()
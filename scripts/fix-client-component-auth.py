@@ -10,9 +10,10 @@ For Client Components ('use client'), we should NOT use:
 Instead, rely on middleware for auth protection.
 """
 
-import re
 from pathlib import Path
 
+from _auth_fix_lib import fix_client_component, write_file_atomic
+
 # Files to fix (all are Client Components)
 FILES_TO_FIX = [
     'src/app/(sppg)/hrd/departments/[id]/edit/page.tsx',
@@ -23,36 +24,6 @@ FILES_TO_FIX = [
     'src/app/(sppg)/procurement/receipts/[id]/edit/page.tsx',
 ]
 
-def fix_client_component_auth(content):
-    """
-    Remove async and auth check from Client Component
-    """
-    # Step 1: Remove auth and redirect imports
-    content = re.sub(
-        r"import\s+\{\s*auth\s*\}\s+from\s+['\"]@/lib/auth['\"]\s*\n",
-        '',
-        content
-    )
-    content = re.sub(
-        r"import\s+\{\s*redirect\s*\}\s+from\s+['\"]next/navigation['\"]\s*\n",
-        '',
-        content
-    )
-    
-    # Step 2: Remove async from function declaration
-    content = re.sub(
-        r'async function (\w+)\(',
-        r'function \1(',
-        content
-    )
-    
-    # Step 3: Remove auth check block
-    # Pattern: Multi-line auth check in function params or body
-    auth_pattern = r'\s*// Authentication check\s*\n\s*const session = await auth\(\)\s*\n\s*const sppgId = session\?\.user\?\.sppgId\s*\n\s*\n\s*if \(!sppgId\) \{\s*\n\s*redirect\([^\)]+\)\s*\n\s*\}\s*\n\s*\n'
-    content = re.sub(auth_pattern, '\n', content, flags=re.MULTILINE)
-    
-    return content
-
 def main():
     print("🔧 Fixing Client Component Auth Pattern\n")
     
@@ -63,14 +34,21 @@ def main():
             print(f"⊘ {file_path} - Not found")
             continue
         
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = path.read_bytes()
+        
+        # Only strip auth from actual Client Components, the directive
+        # has to sit at the top of the file
+        head = raw[:256]
+        if b"'use client'" not in head and b'"use client"' not in head:
+            print(f"⊘ {file_path} - Not a Client Component, skipped")
+            continue
+        
+        content = raw.decode('utf-8')
         
-        fixed_content = fix_client_component_auth(content)
+        fixed_content = fix_client_component(content)
         
         if fixed_content != content:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(fixed_content)
+            write_file_atomic(path, fixed_content)
             print(f"✓ {file_path} - Fixed")
             fixed_count += 1
         else:
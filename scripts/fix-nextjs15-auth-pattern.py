@@ -7,19 +7,17 @@ It handles various function declaration patterns.
 """
 
 import os
-import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[31m'
-    GREEN = '\033[32m'
-    YELLOW = '\033[33m'
-    BLUE = '\033[34m'
-    CYAN = '\033[36m'
-
-def log(message, color=Colors.RESET):
-    print(f"{color}{message}{Colors.RESET}")
+from _auth_fix_lib import (
+    Colors,
+    WRONG_PLACEMENT_RE,
+    fix_nextjs15,
+    flush_log,
+    log,
+    walk_page_tsx,
+    write_file_atomic,
+)
 
 def fix_auth_in_params(content):
     """
@@ -42,90 +40,85 @@ def fix_auth_in_params(content):
           ...
     """
     
-    # Regex to match function with auth in params
-    pattern = r'(async\s+function\s+\w+)\s*\(\s*\{\s*\n(\s*)// Authentication check\s*\n\s*const session = await auth\(\)\s*\n\s*const sppgId = session\?\.user\?\.sppgId\s*\n\s*\n\s*if \(!sppgId\) \{\s*\n\s*redirect\([^\)]+\)\s*\n\s*\}\s*\n\s*\n\s*([^}]+)\}\s*:\s*(\{[^}]+\})\s*\)\s*\{'
-    
-    def replacer(match):
-        func_start = match.group(1)  # async function MyPage
-        indent = match.group(2)  # indentation
-        params_content = match.group(3).strip()  # params
-        params_type = match.group(4)  # { params: ... }
-        
-        # Rebuild correctly
-        return f'''{func_start}({{
-  {params_content}
-}}: {params_type}) {{
-  // Authentication check
-  const session = await auth()
-  const sppgId = session?.user?.sppgId
-
-  if (!sppgId) {{
-    redirect('/access-denied?reason=no-sppg')
-  }}
-
-'''
-    
-    new_content = re.sub(pattern, replacer, content, flags=re.MULTILINE | re.DOTALL)
+    new_content = fix_nextjs15(content)
     
     return new_content if new_content != content else None
 
-def process_file(file_path):
+def _process_file(file_path):
     """Process a single file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            raw = f.read()
         
-        # Check if file needs fixing
-        if '// Authentication check' not in content:
+        # Cheap byte scan first, only decode files that can possibly match
+        if raw.find(b'// Authentication check') == -1:
             return {'status': 'skip', 'reason': 'No auth check'}
+        # `async\s+function` may span any whitespace, so only anchor on the keyword
+        if raw.find(b'function') == -1:
+            return {'status': 'skip', 'reason': 'Auth already correct'}
+        
+        content = raw.decode('utf-8')
         
         # Check if auth is in wrong place
-        wrong_pattern = r'async\s+function\s+\w+\s*\(\s*\{\s*\n\s*// Authentication check'
-        if not re.search(wrong_pattern, content):
+        if not WRONG_PLACEMENT_RE.search(content):
             return {'status': 'skip', 'reason': 'Auth already correct'}
         
-        log(f"\nFixing: {file_path}", Colors.CYAN)
-        
         fixed_content = fix_auth_in_params(content)
         
         if fixed_content is None:
-            log("  ⚠ Could not auto-fix, needs manual review", Colors.YELLOW)
             return {'status': 'skip', 'reason': 'Pattern not matched'}
         
-        # Write back
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
+        # Write back atomically via a temp file
+        write_file_atomic(file_path, fixed_content)
         
-        log("  ✓ Fixed auth placement", Colors.GREEN)
         return {'status': 'success'}
         
     except Exception as e:
-        log(f"  ✗ Error: {str(e)}", Colors.RED)
         return {'status': 'error', 'error': str(e)}
 
+def process_file(file_path):
+    """
+    Process a single file in a worker process.
+    Logging is left to the parent so output stays in file order.
+    """
+    return file_path, _process_file(file_path)
+
 def main():
     log("\n🔧 Fix Next.js 15 Auth Pattern Issues", Colors.BLUE)
     log("=" * 70, Colors.BLUE)
     
-    app_dir = Path('src/app')
+    app_dir = 'src/app'
     
-    if not app_dir.exists():
+    if not os.path.isdir(app_dir):
         log("❌ Error: src/app directory not found", Colors.RED)
         return
     
     # Find all page.tsx files
-    page_files = list(app_dir.rglob('page.tsx'))
+    page_files = walk_page_tsx(app_dir)
     log(f"\n✓ Found {len(page_files)} page.tsx files", Colors.GREEN)
     
     results = {'success': 0, 'skip': 0, 'error': 0}
     fixed_files = []
     
-    for file_path in sorted(page_files):
-        result = process_file(file_path)
+    flush_log()
+    
+    # Files are independent and scanning is CPU bound, so use processes
+    with ProcessPoolExecutor() as executor:
+        processed = list(executor.map(process_file, sorted(page_files), chunksize=16))
+    
+    for file_path, result in processed:
         results[result['status']] += 1
         
         if result['status'] == 'success':
-            fixed_files.append(str(file_path))
+            log(f"\nFixing: {file_path}", Colors.CYAN)
+            log("  ✓ Fixed auth placement", Colors.GREEN)
+            fixed_files.append(file_path)
+        elif result['status'] == 'error':
+            log(f"\nFixing: {file_path}", Colors.CYAN)
+            log(f"  ✗ Error: {result['error']}", Colors.RED)
+        elif result['reason'] == 'Pattern not matched':
+            log(f"\nFixing: {file_path}", Colors.CYAN)
+            log("  ⚠ Could not auto-fix, needs manual review", Colors.YELLOW)
     
     # Summary
     log("\n" + "=" * 70, Colors.BLUE)
@@ -147,4 +140,7 @@ def main():
         log("\n⚠️  No files needed fixing", Colors.YELLOW)
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        flush_log()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Fix all auth check issues in page components in a single pass
+
+Combines fix-auth-placement.py, fix-nextjs15-auth-pattern.py and
+fix-client-component-auth.py. Every page.tsx under src/app is read once,
+all transformations run in memory, and the file is written at most once.
+
+- Server Components: move the auth check out of the function parameters
+  into the function body
+- Client Components ('use client'): remove the auth check, the auth and
+  redirect imports and the async keyword, middleware handles auth there
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from _auth_fix_lib import (
+    Colors,
+    fix_client_component,
+    fix_nextjs15,
+    fix_server_placement,
+    flush_log,
+    log,
+    walk_page_tsx,
+    write_file_atomic,
+)
+
+def _process_file(file_path):
+    """Read once, apply every fix in memory, write at most once"""
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+
+        if raw.find(b'// Authentication check') == -1:
+            return {'status': 'skip', 'reason': 'No auth check'}
+
+        # The 'use client' directive has to sit at the top of the file
+        head = raw[:256]
+        is_client = b"'use client'" in head or b'"use client"' in head
+
+        content = raw.decode('utf-8')
+
+        if is_client:
+            fixed_content = fix_client_component(content)
+        else:
+            fixed_content = fix_nextjs15(fix_server_placement(content))
+
+        if fixed_content == content:
+            return {'status': 'skip', 'reason': 'No changes needed'}
+
+        write_file_atomic(file_path, fixed_content)
+
+        return {'status': 'success', 'kind': 'client' if is_client else 'server'}
+
+    except Exception as e:
+        return {'status': 'error', 'error': str(e)}
+
+def process_file(file_path):
+    """
+    Process a single file in a worker process.
+    Logging is left to the parent so output stays in file order.
+    """
+    return file_path, _process_file(file_path)
+
+def main():
+    log("\n🔧 Fix Auth Check Issues in Page Components", Colors.BLUE)
+    log("=" * 70, Colors.BLUE)
+
+    app_dir = 'src/app'
+
+    if not os.path.isdir(app_dir):
+        log("❌ Error: src/app directory not found", Colors.RED)
+        return
+
+    page_files = sorted(walk_page_tsx(app_dir))
+    log(f"\n✓ Found {len(page_files)} page.tsx files", Colors.GREEN)
+
+    results = {'success': 0, 'skip': 0, 'error': 0}
+
+    flush_log()
+
+    with ProcessPoolExecutor() as executor:
+        processed = list(executor.map(process_file, page_files, chunksize=16))
+
+    for file_path, result in processed:
+        results[result['status']] += 1
+
+        if result['status'] == 'success':
+            log(f"\nFixing: {file_path}", Colors.CYAN)
+            if result['kind'] == 'client':
+                log("  ✓ Removed auth check from Client Component", Colors.GREEN)
+            else:
+                log("  ✓ Fixed auth placement", Colors.GREEN)
+        elif result['status'] == 'error':
+            log(f"\n❌ Error in {file_path}:", Colors.RED)
+            log(f"   {result['error']}", Colors.RED)
+
+    # Summary
+    log("\n" + "=" * 70, Colors.BLUE)
+    log("📊 Fix Summary:", Colors.BLUE)
+    log("=" * 70, Colors.BLUE)
+    log(f"✓ Fixed: {results['success']} files", Colors.GREEN)
+    log(f"⊘ Skipped: {results['skip']} files", Colors.YELLOW)
+    log(f"✗ Errors: {results['error']} files", Colors.RED)
+
+    if results['success'] > 0:
+        log("\n📝 Next step: Run 'npx tsc --noEmit' to verify", Colors.CYAN)
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        flush_log()
@@ -1,32 +1,64 @@
 #!/usr/bin/env python3
-import re
+import mmap
+import os
+import shutil
 
 FILE = "prisma/seeds/inventory-seed.ts"
 BACKUP = FILE + ".backup3"
-
-# Read file
-with open(FILE, "r") as f:
-    content = f.read()
-
-# Backup
-with open(BACKUP, "w") as f:
-    f.write(content)
+TMP = FILE + ".tmp"
 
 # Replace all getFoodCategoryId calls to remove second parameter
 # Pattern: getFoodCategoryId('ItemName', 'CATEGORY')
 # Replace with: getFoodCategoryId('ItemName')
+# Every call shares a literal prefix, so scan with find instead of regex
+
+PREFIX = b"getFoodCategoryId('"
+
+# Backup: hard link the original. The new content is swapped in with
+# os.replace below, so the backup keeps the old inode untouched. Fall back
+# to a kernel-side copy where links aren't supported.
+if os.path.exists(BACKUP):
+    os.remove(BACKUP)
+try:
+    os.link(FILE, BACKUP)
+except OSError:
+    shutil.copyfile(FILE, BACKUP)
+
+# Map the file instead of reading it, the scan works on the raw bytes so
+# no decoded copy of the whole seed is ever held in memory
+with open(FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+    parts = []
+    last = 0
+    changes = 0
+    start = content.find(PREFIX)
+    while start != -1:
+        name_start = start + len(PREFIX)
+        name_end = content.find(b"'", name_start)
+        if name_end <= name_start or content[name_end + 1:name_end + 2] != b",":
+            start = content.find(PREFIX, name_start)
+            continue
 
-pattern = r"getFoodCategoryId\('([^']+)',\s*'[^']+'\)"
-replacement = r"getFoodCategoryId('\1')"
+        # Second argument: optional whitespace, then a quoted category code
+        arg = name_end + 2
+        while content[arg:arg + 1].isspace():
+            arg += 1
+        arg_end = content.find(b"'", arg + 1) if content[arg:arg + 1] == b"'" else -1
+        if arg_end <= arg + 1 or content[arg_end + 1:arg_end + 2] != b")":
+            start = content.find(PREFIX, name_start)
+            continue
 
-new_content = re.sub(pattern, replacement, content)
+        parts.append(content[last:name_end + 1])
+        parts.append(b")")
+        last = arg_end + 2
+        changes += 1
+        start = content.find(PREFIX, last)
 
-# Count changes
-changes = content.count("getFoodCategoryId(") - new_content.count(", '")
+    parts.append(content[last:])
 
-# Write back
-with open(FILE, "w") as f:
-    f.write(new_content)
+# Write to a temp file and swap it in atomically
+with open(TMP, "wb") as f:
+    f.writelines(parts)
+os.replace(TMP, FILE)
 
 print(f"✅ Fixed getFoodCategoryId calls in inventory-seed.ts")
 print(f"📊 Updated {changes} function calls to remove category parameter")
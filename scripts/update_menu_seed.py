@@ -1,59 +1,81 @@
 #!/usr/bin/env python3
+import mmap
+import os
+import shutil
 import re
 
 FILE = "prisma/seeds/menu-seed.ts"
 BACKUP = FILE + ".backup2"
+TMP = FILE + ".tmp"
 
-# Read file
-with open(FILE, "r") as f:
-    content = f.read()
-
-# Backup
-with open(BACKUP, "w") as f:
-    f.write(content)
+_MENU_RE = re.compile(rb"menuName: '([^']+)',\s+description: '([^']+)',\s+mealType:")
 
 # Step 1: Add category fetch in seedNutritionMenus function
+# FoodCategory ids are cuid()s generated when food-category-seed.ts upserts
+# by categoryCode, so they can't be inlined here as literals and are still
+# resolved at seed time. Only the columns the helper reads are fetched.
+school_lunch_line = "  const schoolLunchProgram = programs.find(p => p.programCode === 'PWK-PMAS-2025')!".encode("utf-8")
+
 fetch_code = """  // Fetch all food categories for mapping
   console.log('  → Fetching food categories...')
   const foodCategories = await prisma.foodCategory.findMany({
-    select: { id: true, categoryCode: true, categoryName: true }
+    select: { id: true, categoryCode: true }
   })
   const categoryMap = new Map(foodCategories.map(c => [c.categoryCode, c.id]))
   console.log(`  ✓ Loaded ${foodCategories.length} food categories`)
   
-  // Helper to get foodCategoryId
+  // Helper to get foodCategoryId, memoized per (menuName, description)
+  const categoryIdCache = new Map<string, string | undefined>()
   const getFoodCategoryId = (menuName: string, description: string): string | undefined => {
+    const key = `${menuName}\\0${description}`
+    if (categoryIdCache.has(key)) {
+      return categoryIdCache.get(key)
+    }
     const code = getMenuCategoryCode(menuName, description)
-    return code ? categoryMap.get(code) : undefined
+    const id = code ? categoryMap.get(code) : undefined
+    categoryIdCache.set(key, id)
+    return id
   }
 
-  const schoolLunchProgram = programs.find(p => p.programCode === 'PWK-PMAS-2025')!"""
-
-# Replace the line with schoolLunchProgram
-content = content.replace(
-    "  const schoolLunchProgram = programs.find(p => p.programCode === 'PWK-PMAS-2025')!",
-    fetch_code
-)
+  const schoolLunchProgram = programs.find(p => p.programCode === 'PWK-PMAS-2025')!""".encode("utf-8")
 
-# Step 2: Add foodCategoryId to all menu creates
-# Pattern: find create blocks with menuName, description, mealType
-pattern = r"(menuName: '([^']+)',\s+description: '([^']+)',\s+mealType:)"
+# Backup: hard link the original. The new content is swapped in with
+# os.replace below, so the backup keeps the old inode untouched. Fall back
+# to a kernel-side copy where links aren't supported.
+if os.path.exists(BACKUP):
+    os.remove(BACKUP)
+try:
+    os.link(FILE, BACKUP)
+except OSError:
+    shutil.copyfile(FILE, BACKUP)
 
-def replacer(match):
-    menu_name = match.group(2)
-    description = match.group(3)
-    
-    # Add foodCategoryId
-    return f"menuName: '{menu_name}',\n        description: '{description}',\n        foodCategoryId: getFoodCategoryId('{menu_name}', '{description}'),\n        mealType:"
+# Map the file instead of reading it, everything below works on the raw
+# bytes so no decoded copy of the whole seed is ever held in memory
+with open(FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+    # Step 2: Add foodCategoryId to all menu creates
+    # Pattern: find create blocks with menuName, description, mealType
+    # Rebuild from slices in a single pass, counting matches as we go.
+    # The schoolLunchProgram line never overlaps a menu match, so Step 1
+    # is applied to each untouched slice.
+    parts = []
+    last = 0
+    changes = 0
+    for match in _MENU_RE.finditer(content):
+        menu_name = match.group(1)
+        description = match.group(2)
 
-new_content = re.sub(pattern, replacer, content)
+        # Add foodCategoryId
+        parts.append(content[last:match.start()].replace(school_lunch_line, fetch_code))
+        parts.append(b"menuName: '%s',\n        description: '%s',\n        foodCategoryId: getFoodCategoryId('%s', '%s'),\n        mealType:" % (menu_name, description, menu_name, description))
+        last = match.end()
+        changes += 1
 
-# Count changes
-changes = new_content.count("foodCategoryId: getFoodCategoryId") - content.count("foodCategoryId: getFoodCategoryId")
+    parts.append(content[last:].replace(school_lunch_line, fetch_code))
 
-# Write back
-with open(FILE, "w") as f:
-    f.write(new_content)
+# Write to a temp file and swap it in atomically
+with open(TMP, "wb") as f:
+    f.writelines(parts)
+os.replace(TMP, FILE)
 
 print(f"✅ Updated menu-seed.ts with foodCategoryId")
 print(f"📊 Added foodCategoryId to {changes} menus")